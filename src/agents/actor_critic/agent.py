@@ -1,5 +1,3 @@
-import numpy as np
-
 from .knowledge import Knowledge
 from .interpreter import Interpreter
 from .actuator import Actuator
@@ -49,7 +47,7 @@ class Agent():
         pass
 
     def end_episode(self, current_episode):
-        episode_reward = np.sum(np.array(self.rewards))
+        episode_reward = sum(self.rewards)
         if episode_reward > self.max_reward:
             self.max_reward = episode_reward
         print(f"Episode: {current_episode}, Episode_reward: {episode_reward}, "
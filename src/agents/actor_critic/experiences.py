@@ -3,18 +3,25 @@ import numpy as np
 
 class Experiences():
     def __init__(self):
-        self.experiences = []
+        self.reset()
 
     def add(self, state, reward, agent_action, next_state):
-        self.experiences.append( 
-            (state.tolist(), reward, agent_action, next_state.tolist())
-        )
+        # copies, the interpreter reuses its state buffer between steps
+        self.states.append(np.array(state))
+        self.rewards.append(reward)
+        self.actions.append(agent_action)
+        self.next_states.append(np.array(next_state))
 
     def get(self, batch_size=None):
-        if not batch_size:
-            return np.array(self.experiences)
-        else:
-            return np.array(self.experiences[batch_size])
+        return (
+            np.stack(self.states[:batch_size]),
+            np.array(self.rewards[:batch_size]),
+            np.array(self.actions[:batch_size]),
+            np.stack(self.next_states[:batch_size])
+        )
 
     def reset(self):
-        self.experiences = []
+        self.states = []
+        self.rewards = []
+        self.actions = []
+        self.next_states = []
@@ -1,10 +1,16 @@
-import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
 
-from torch.distributions.categorical import Categorical
+
+def discounted_sums(xs, discount, initial=0.0):
+    sums = [0.0] * len(xs)
+    running = initial
+    for i in reversed(range(len(xs))):
+        running = discount * running + xs[i]
+        sums[i] = running
+    return sums
 
 
 class ActorCritic(torch.nn.Module):
@@ -54,16 +60,18 @@ class Knowledge():
                                     lr=self.learning_rate)
 
     def get_action(self, state):
-        policy, _ = self.model(torch.tensor(state).unsqueeze(0))
-        action = F.softmax(policy, -1).multinomial(num_samples=1)
+        with torch.no_grad():
+            policy, _ = self.model(torch.from_numpy(state).unsqueeze(0))
+            action = F.softmax(policy, -1).multinomial(num_samples=1)
 
         return action
 
     def train(self, experiences):
-        states  = torch.tensor(experiences[:, 0].tolist()).double()
-        rewards = torch.tensor(experiences[:, 1].tolist()).double()
-        actions = torch.tensor(experiences[:, 2].tolist()).long()
-        next_states = torch.tensor(experiences[:, 3].tolist()).double()
+        states, rewards, actions, next_states = experiences
+        states  = torch.from_numpy(states).double()
+        rewards = torch.from_numpy(rewards).double()
+        actions = torch.from_numpy(actions).long()
+        next_states = torch.from_numpy(next_states).double()
 
         logits, values = self.model(states)
         probs     = F.softmax(logits, -1)
@@ -74,25 +82,26 @@ class Knowledge():
         _, value = self.model(next_states[-1].unsqueeze(0))
         values = torch.cat((values, value.data))
 
-        policy_loss = 0
-        value_loss = 0
-        R = values[-1]
-        gae = torch.zeros(1, 1)
-        for i in reversed(range(len(rewards))):
-            R = self.gamma * R + rewards[i]
-            advantage = R - values[i]
-            value_loss = value_loss + 0.5 * advantage.pow(2)
-
-            # Generalized Advantage Estimation
-            delta_t = (rewards[i] +
-                       self.gamma * values[i + 1].data -
-                       values[i].data)
-
-            gae = gae.double() * self.gamma * self.tau + delta_t
-
-            policy_loss = (policy_loss -
-                           log_probs[i] * gae -
-                           self.entropy_coef * entropies[i])
+        # TD errors for every step at once, accumulated into GAE below
+        deltas = (rewards.unsqueeze(1) +
+                  self.gamma * values[1:].data -
+                  values[:-1].data)
+        gamma_tau = self.gamma * self.tau
+
+        # returns and GAE carry no gradient, so the backward recurrences run
+        # on plain floats and the losses are reduced in single tensor ops
+        returns = torch.tensor(
+            discounted_sums(rewards.tolist(), self.gamma, values[-1].item()),
+            dtype=torch.double)
+        advantages = returns.unsqueeze(1) - values[:-1]
+        value_loss = 0.5 * advantages.pow(2).sum()
+
+        # Generalized Advantage Estimation
+        gae = torch.tensor(
+            discounted_sums(deltas.squeeze(1).tolist(), gamma_tau),
+            dtype=torch.double)
+        policy_loss = (-(log_probs * gae.unsqueeze(1)).sum() -
+                       self.entropy_coef * entropies.sum())
 
         self.optimizer.zero_grad()
         loss_fn = (policy_loss + self.value_loss_coef * value_loss)
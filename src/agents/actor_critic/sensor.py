@@ -1,6 +1,3 @@
-import numpy as np
-
-
 class Sensor():
     def __init__(self, observation):
         self.data = self.preprocess_obs(observation)
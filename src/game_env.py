@@ -2,14 +2,27 @@ from krpc_helper import KRPCHelper
 from settings import Settings
 
 
+# action 0 is the do nothing action (wait) and action 9 activates next stage
+CONTROL_ACTIONS = {
+    1: ("pitch", -1),
+    2: ("pitch", 1),
+    3: ("roll", -1),
+    4: ("roll", 1),
+    5: ("yaw", -1),
+    6: ("yaw", 1),
+    7: ("throttle", 0),
+    8: ("throttle", 1),
+}
+
+
 class GameEnv(object):
     def __init__(self, settings: Settings):
         self.kh = KRPCHelper(settings)
         self.settings = settings
-        self.action_space  # TODO: Define Action Space
-        self.observation_space  # TODO: Define Observation Space
+        self.action_space = None  # TODO: Define Action Space
+        self.observation_space = None  # TODO: Define Observation Space
 
-        self.last_altitude = 0
+        self.last_altitude = 0.0
 
     def step(self, action):
         done = False
@@ -17,37 +30,27 @@ class GameEnv(object):
         self.kh.reset_controls()
 
         self.choose_action(action)
+        self.kh.wait_for_update()
 
         state = self.get_state()
         reward = self.get_reward()
-        done = self.epoch_ending()
+        reward, done = self.epoch_ending(reward)
 
         return state, reward, done, {}
 
     def choose_action(self, action):
-        if action == 0:  # do nothing action, wait
-            pass
-        elif action == 1:
-            self.kh.vessel.control.pitch = -1
-        elif action == 2:
-            self.kh.vessel.control.pitch = 1
-        elif action == 3:
-            self.kh.vessel.control.roll = -1
-        elif action == 4:
-            self.kh.vessel.control.roll = 1
-        elif action == 5:
-            self.kh.vessel.control.yaw = -1
-        elif action == 6:
-            self.kh.vessel.control.yaw = 1
-        elif action == 7:
-            self.kh.vessel.control.throttle = 0
-        elif action == 8:
-            self.kh.vessel.control.throttle = 1
-        elif action == 9:
-            self.kh.vessel.activate_next_stage()
-
-    def epoch_ending(self, done):
-        if self.crew() == 0:
+        if action == 9:
+            self.kh.control.activate_next_stage()
+            return
+
+        control_action = CONTROL_ACTIONS.get(action)
+        if control_action is not None:
+            name, value = control_action
+            setattr(self.kh.control, name, value)
+
+    def epoch_ending(self, reward):
+        done = False
+        if self.kh.get_crew_count() == 0:
             reward = -1
             done = True
             print('crew is dead :(')
@@ -55,14 +58,15 @@ class GameEnv(object):
 
     def get_reward(self):
         reward = -0.1
-        if self.kh.get_telemetry().f_mean_altitude > self.last_altitude:
+        altitude = self.kh.get_mean_altitude()
+        if altitude > self.last_altitude:
             reward = 0.1
-        self.last_altitude = self.kh.get_telemetry().f_mean_altitude
+        self.last_altitude = altitude
         return reward
 
     def reset(self):
         self.kh.load_game()
-        self.last_altitude = 0
+        self.last_altitude = 0.0
         state = self.get_state()
         return state
 
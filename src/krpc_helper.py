@@ -1,5 +1,6 @@
 from typing import Tuple, List
 import krpc
+from krpc.error import StreamError
 import json
 from settings import Settings
 
@@ -99,6 +100,40 @@ class Telemetry(object):
         return json.dumps(self, default=lambda o: o.__dict__)
 
 
+def has_value(stream) -> bool:
+    # a started stream raises until its first update arrives
+    try:
+        stream()
+    except StreamError:
+        return False
+    return True
+
+
+# seconds to wait for a stream update before reading the last known values
+STREAM_UPDATE_TIMEOUT = 1.0
+
+# Telemetry fields streamed from the active vessel: (field, source, attribute)
+TELEMETRY_STREAMS = (
+    ("o_apoapsis_altitude", "orbit", "apoapsis_altitude"),
+    ("o_periapsis_altitude", "orbit", "periapsis_altitude"),
+    ("f_mean_altitude", "flight", "mean_altitude"),
+    ("f_g_force", "flight", "g_force"),
+    ("f_rotation", "flight", "rotation"),
+    ("f_direction", "flight", "direction"),
+    ("f_normal", "flight", "normal"),
+    ("f_anti_normal", "flight", "anti_normal"),
+    ("f_radial", "flight", "radial"),
+    ("f_anti_radial", "flight", "anti_radial"),
+    ("f_atmosphere_density", "flight", "atmosphere_density"),
+    ("f_dynamic_pressure", "flight", "dynamic_pressure"),
+    ("f_static_pressure", "flight", "static_pressure"),
+    ("f_aerodynamic_force", "flight", "aerodynamic_force"),
+    ("f_drag", "flight", "drag"),
+    ("f_lift", "flight", "lift"),
+    ("ut", "space_center", "ut"),
+)
+
+
 class KRPCHelper(object):
     def __init__(self, settings: Settings):
         conn_settings: dict = {
@@ -108,26 +143,77 @@ class KRPCHelper(object):
         }
         self.settings: Settings = settings
         self.conn = krpc.connect(**conn_settings)
+        self.vessel = None
+        self.control = None
+        self.telemetry_streams: dict = {}
 
     def reset_controls(self):
-        self.conn.space_center.active_vessel.control.sas = False
-        self.conn.space_center.active_vessel.control.rcs = False
-        self.conn.space_center.active_vessel.control.pitch = 0
-        self.conn.space_center.active_vessel.control.yaw = 0
-        self.conn.space_center.active_vessel.control.roll = 0
-        self.conn.space_center.active_vessel.control.throttle = 0
+        if self.vessel is None:
+            self.bind_vessel()
+        self.control.sas = False
+        self.control.rcs = False
+        self.control.pitch = 0
+        self.control.yaw = 0
+        self.control.roll = 0
+        self.control.throttle = 0
+
+    def wait_for_update(self, timeout: float = STREAM_UPDATE_TIMEOUT):
+        # the server only sends updates when a streamed value changes, so a
+        # paused game would otherwise block here forever
+        if self.vessel is None:
+            self.bind_vessel()
+        with self.conn.stream_update_condition:
+            self.conn.wait_for_stream_update(timeout)
 
     def load_game(self):
+        self.unbind_vessel()
         self.conn.space_center.load(self.settings.save_game_name)
+        self.bind_vessel()
+
+    def bind_vessel(self):
+        self.vessel = self.conn.space_center.active_vessel
+        self.control = self.vessel.control
+        self.create_telemetry_streams()
+        self.start_telemetry_streams()
+
+    def unbind_vessel(self):
+        for stream in self.telemetry_streams.values():
+            stream.remove()
+        self.vessel = None
+        self.control = None
+        self.telemetry_streams = {}
+
+    def create_telemetry_streams(self):
+        sources = {
+            "orbit": self.vessel.orbit,
+            "flight": self.vessel.flight(),
+            "space_center": self.conn.space_center,
+        }
+        self.telemetry_streams = {
+            name: self.conn.add_stream(getattr, sources[source], attribute)
+            for name, source, attribute in TELEMETRY_STREAMS
+        }
+        self.telemetry_streams["crew_count"] = self.conn.add_stream(
+            getattr, self.vessel, 'crew_count')
+
+    def start_telemetry_streams(self):
+        # start every stream at once and wait for their first values here, so
+        # the first step does not wait on each stream one after another
+        streams = self.telemetry_streams.values()
+        for stream in streams:
+            stream.start(wait=False)
+        with self.conn.stream_update_condition:
+            while not all(has_value(stream) for stream in streams):
+                self.conn.wait_for_stream_update(STREAM_UPDATE_TIMEOUT)
 
     def get_resources(self, avr: list) -> List[Resource]:
         resources: List[Resource] = []
         for r in avr:
             resources.append(Resource(
-                self.conn.add_stream(getattr, r, 'name')(),
-                self.conn.add_stream(getattr, r, 'amount')(),
-                self.conn.add_stream(getattr, r, 'max')(),
-                self.conn.add_stream(getattr, r, 'density')()
+                r.name,
+                r.amount,
+                r.max,
+                r.density
             ))
         return resources
 
@@ -135,49 +221,40 @@ class KRPCHelper(object):
         parts: List[Part] = []
         for p in avp:
             parts.append(Part(
-                self.conn.add_stream(getattr, p, 'name')(),
-                self.conn.add_stream(getattr, p, 'axially_attached')(),
-                self.conn.add_stream(getattr, p, 'radially_attached')(),
-                self.conn.add_stream(getattr, p, 'stage')(),
-                self.conn.add_stream(getattr, p, 'decouple_stage')(),
-                self.conn.add_stream(getattr, p, 'mass')(),
-                self.conn.add_stream(getattr, p, 'dry_mass')(),
-                self.conn.add_stream(getattr, p, 'dynamic_pressure')(),
-                self.conn.add_stream(getattr, p, 'temperature')(),
-                self.conn.add_stream(getattr, p, 'skin_temperature')(),
-                self.conn.add_stream(getattr, p, 'thermal_conduction_flux')(),
-                self.conn.add_stream(getattr, p, 'thermal_convection_flux')(),
-                self.conn.add_stream(getattr, p, 'thermal_radiation_flux')(),
-                self.conn.add_stream(getattr, p, 'thermal_internal_flux')()
+                p.name,
+                p.axially_attached,
+                p.radially_attached,
+                p.stage,
+                p.decouple_stage,
+                p.mass,
+                p.dry_mass,
+                p.dynamic_pressure,
+                p.temperature,
+                p.skin_temperature,
+                p.thermal_conduction_flux,
+                p.thermal_convection_flux,
+                p.thermal_radiation_flux,
+                p.thermal_internal_flux
             ))
         return parts
         
+    def get_crew_count(self) -> int:
+        if self.vessel is None:
+            self.bind_vessel()
+        return self.telemetry_streams["crew_count"]()
+
+    def get_mean_altitude(self) -> float:
+        if self.vessel is None:
+            self.bind_vessel()
+        return self.telemetry_streams["f_mean_altitude"]()
+
     def get_telemetry(self) -> Telemetry:
-        sc = self.conn.space_center
-        av = sc.active_vessel
-        avo = av.orbit
-        avf = av.flight()
-        avr = av.resources.all
-        avp = av.parts.all
+        if self.vessel is None:
+            self.bind_vessel()
+        ts = self.telemetry_streams
 
         return Telemetry(
-            self.conn.add_stream(getattr, avo, 'apoapsis_altitude')(),
-            self.conn.add_stream(getattr, avo, 'periapsis_altitude')(),
-            self.conn.add_stream(getattr, avf, 'mean_altitude')(),
-            self.conn.add_stream(getattr, avf, 'g_force')(),
-            self.conn.add_stream(getattr, avf, 'rotation')(),
-            self.conn.add_stream(getattr, avf, 'direction')(),
-            self.conn.add_stream(getattr, avf, 'normal')(),
-            self.conn.add_stream(getattr, avf, 'anti_normal')(),
-            self.conn.add_stream(getattr, avf, 'radial')(),
-            self.conn.add_stream(getattr, avf, 'anti_radial')(),
-            self.conn.add_stream(getattr, avf, 'atmosphere_density')(),
-            self.conn.add_stream(getattr, avf, 'dynamic_pressure')(),
-            self.conn.add_stream(getattr, avf, 'static_pressure')(),
-            self.conn.add_stream(getattr, avf, 'aerodynamic_force')(),
-            self.conn.add_stream(getattr, avf, 'drag')(),
-            self.conn.add_stream(getattr, avf, 'lift')(),
-            self.get_resources(avr),
-            self.get_parts(avp),
-            self.conn.add_stream(getattr, sc, 'ut')(),
+            r_resources=self.get_resources(self.vessel.resources.all),
+            p_parts=[],  # Telemetry does not keep p_parts, skip building them
+            **{name: ts[name]() for name, _, _ in TELEMETRY_STREAMS}
         )
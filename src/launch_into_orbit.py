@@ -6,17 +6,29 @@ from settings import Settings
 from krpc_helper import KRPCHelper
 
 
+def wait_until(conn, expression):
+    event = conn.krpc.add_event(expression)
+    with event.condition:
+        event.wait()
+    event.remove()
+
+
 def main():
     print("Hello World!")
 
     kh = KRPCHelper(Settings())
 
-    turn_start_altitude = 250
-    turn_end_altitude = 45000
-    target_altitude = 150000
+    turn_start_altitude = 250.0
+    turn_end_altitude = 45000.0
+    turn_slope = 90.0 / (turn_end_altitude - turn_start_altitude)
+    target_altitude = 150000.0
+    approach_altitude = target_altitude*0.9
 
     conn = krpc.connect(name='Launch into orbit')
     vessel = conn.space_center.active_vessel
+    control = vessel.control
+    auto_pilot = vessel.auto_pilot
+    Expression = conn.krpc.Expression
 
     # Set up streams for telemetry
     ut = conn.add_stream(getattr, conn.space_center, 'ut')
@@ -29,9 +41,9 @@ def main():
     srb_fuel = conn.add_stream(stage_2_resources.amount, 'SolidFuel')
 
     # Pre-launch setup
-    vessel.control.sas = False
-    vessel.control.rcs = False
-    vessel.control.throttle = 1.0
+    control.sas = False
+    control.rcs = False
+    control.throttle = 1.0
 
     # Countdown...
     print('3...')
@@ -42,51 +54,55 @@ def main():
     time.sleep(1)
     print('Launch!')
 
-    vessel.control.activate_next_stage()
-    vessel.auto_pilot.engage()
-    vessel.auto_pilot.target_pitch_and_heading(90, 90)
+    control.activate_next_stage()
+    auto_pilot.engage()
+    auto_pilot.target_pitch_and_heading(90, 90)
 
     log_file = open('log.json', 'a')
+    write_log = log_file.write
+    get_telemetry = kh.get_telemetry
 
     # Main ascent loop
     srbs_separated = False
-    turn_angle = 0
+    turn_angle = 0.0
     while True:
 
-        log_file.write(f'{kh.get_telemetry().json()}\n')
+        write_log(f'{get_telemetry().json()}\n')
 
         # Gravity turn
-        if altitude() > turn_start_altitude and altitude() < turn_end_altitude:
-            frac = ((altitude() - turn_start_altitude) /
-                    (turn_end_altitude - turn_start_altitude))
-            new_turn_angle = frac * 90
+        current_altitude = altitude()
+        if turn_start_altitude < current_altitude < turn_end_altitude:
+            new_turn_angle = (
+                (current_altitude - turn_start_altitude) * turn_slope)
             if abs(new_turn_angle - turn_angle) > 0.5:
                 turn_angle = new_turn_angle
-                vessel.auto_pilot.target_pitch_and_heading(90-turn_angle, 90)
+                auto_pilot.target_pitch_and_heading(90-turn_angle, 90)
 
         # Separate SRBs when finished
         if not srbs_separated:
             if srb_fuel() < 0.1:
-                vessel.control.activate_next_stage()
+                control.activate_next_stage()
                 srbs_separated = True
                 print('SRBs separated')
 
         # Decrease throttle when approaching target apoapsis
-        if apoapsis() > target_altitude*0.9:
+        if apoapsis() > approach_altitude:
             print('Approaching target apoapsis')
             break
 
     # Disable engines when target apoapsis is reached
-    vessel.control.throttle = 0.25
-    while apoapsis() < target_altitude:
-        pass
+    control.throttle = 0.25
+    wait_until(conn, Expression.greater_than_or_equal(
+        Expression.call(conn.get_call(getattr, vessel.orbit, 'apoapsis_altitude')),
+        Expression.constant_double(target_altitude)))
     print('Target apoapsis reached')
-    vessel.control.throttle = 0.0
+    control.throttle = 0.0
 
     # Wait until out of atmosphere
     print('Coasting out of atmosphere')
-    while altitude() < 70500:
-        pass
+    wait_until(conn, Expression.greater_than_or_equal(
+        Expression.call(conn.get_call(getattr, vessel.flight(), 'mean_altitude')),
+        Expression.constant_double(70500.0)))
 
     # Plan circularization burn (using vis-viva equation)
     print('Planning circularization burn')
@@ -94,10 +110,11 @@ def main():
     r = vessel.orbit.apoapsis
     a1 = vessel.orbit.semi_major_axis
     a2 = r
-    v1 = math.sqrt(mu*((2./r)-(1./a1)))
-    v2 = math.sqrt(mu*((2./r)-(1./a2)))
+    two_over_r = 2./r
+    v1 = math.sqrt(mu*(two_over_r-(1./a1)))
+    v2 = math.sqrt(mu*(two_over_r-(1./a2)))
     delta_v = v2 - v1
-    node = vessel.control.add_node(
+    node = control.add_node(
         ut() + vessel.orbit.time_to_apoapsis, prograde=delta_v)
 
     # Calculate burn time (using rocket equation)
@@ -107,36 +124,38 @@ def main():
     m1 = m0 / math.exp(delta_v/Isp)
     flow_rate = F / Isp
     burn_time = (m0 - m1) / flow_rate
+    half_burn_time = burn_time/2.
 
     # Orientate ship
     print('Orientating ship for circularization burn')
-    vessel.auto_pilot.reference_frame = node.reference_frame
-    vessel.auto_pilot.target_direction = (0, 1, 0)
-    vessel.auto_pilot.wait()
+    auto_pilot.reference_frame = node.reference_frame
+    auto_pilot.target_direction = (0, 1, 0)
+    auto_pilot.wait()
 
     # Wait until burn
     print('Waiting until circularization burn')
-    burn_ut = ut() + vessel.orbit.time_to_apoapsis - (burn_time/2.)
+    burn_ut = ut() + vessel.orbit.time_to_apoapsis - half_burn_time
     lead_time = 5
     conn.space_center.warp_to(burn_ut - lead_time)
 
     # Execute burn
     print('Ready to execute burn')
-    time_to_apoapsis = conn.add_stream(getattr, vessel.orbit, 'time_to_apoapsis')
-    while time_to_apoapsis() - (burn_time/2.) > 0:
-        pass
+    wait_until(conn, Expression.less_than_or_equal(
+        Expression.call(conn.get_call(getattr, vessel.orbit, 'time_to_apoapsis')),
+        Expression.constant_double(half_burn_time)))
     print('Executing burn')
-    vessel.control.throttle = 1.0
+    control.throttle = 1.0
     time.sleep(burn_time - 0.1)
     print('Fine tuning')
-    vessel.control.throttle = 0.05
-    remaining_burn = conn.add_stream(
+    control.throttle = 0.05
+    remaining_burn = conn.get_call(
         node.remaining_burn_vector,
         node.reference_frame
     )
-    while remaining_burn()[1] > 0:
-        pass
-    vessel.control.throttle = 0.0
+    wait_until(conn, Expression.less_than_or_equal(
+        Expression.get(Expression.call(remaining_burn), Expression.constant_int(1)),
+        Expression.constant_double(0.0)))
+    control.throttle = 0.0
     node.remove()
 
     print('Launch complete')